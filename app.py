@@ -2,7 +2,10 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 from pvlib.location import Location
+from turbidez_linke import obtener_turbidez_linke
+from mapa_calor import mapa_hsp_progresivo, dimensionar_mapa
 import math
+import time
 import numpy as np
 
 # --- CONFIGURACIÓN ---
@@ -63,7 +66,7 @@ def dimensionar_sistema_completo(lat, lon, consumo_diario_kwh, dias_autonomia, t
     eficienca_sistema = 0.85
     site = Location(lat, lon, tz=tz)
     times = pd.date_range(start='2024-06-21 00:00', end='2024-06-21 23:59', freq='1h', tz=tz)
-    clearsky = site.get_clearsky(times)
+    clearsky = site.get_clearsky(times, linke_turbidity=obtener_turbidez_linke(times, lat, lon))
     hsp = clearsky['ghi'].sum() / 1000 # Convertir radiación total a Horas Sol Pico
     
     # Factor de seguridad (1.3) para recuperar carga
@@ -171,9 +174,53 @@ with tab1:
     st.pyplot(fig)
 
 with tab2:
-    # Mapa interactivo simple
-    map_data = pd.DataFrame({'lat': [lat], 'lon': [lon]})
-    st.map(map_data, zoom=10)
+    modo_mapa = st.radio("Modo", ["📍 Ubicación", "🌡️ Mapa de Calor Regional"], horizontal=True)
+
+    if modo_mapa == "📍 Ubicación":
+        # Mapa interactivo simple
+        map_data = pd.DataFrame({'lat': [lat], 'lon': [lon]})
+        st.map(map_data, zoom=10)
+    else:
+        m1, m2 = st.columns(2)
+        metrica = m1.selectbox("Variable", ["Horas Sol Pico (HSP)", "Paneles Necesarios"])
+        radio_mapa = m2.slider("Radio de la Región (°)", 0.5, 5.0, 2.0, 0.5)
+        st.caption("Se calcula primero una grilla gruesa y luego se refina por tiles. Los tiles quedan en caché: mover el centro o volver a una zona no recalcula.")
+
+        if metrica == "Paneles Necesarios":
+            etiqueta, cmap = f"Paneles de {panel_w} W", 'viridis_r'
+        else:
+            etiqueta, cmap = "HSP (kWh/m²/día)", 'inferno'
+
+        grafica_mapa = st.empty()
+        barra = st.progress(0.0)
+        escala = None # (vmin, vmax) fija desde la pasada gruesa: los colores no saltan entre cuadros
+        ultimo_dibujo = 0.0
+        for hsp_grilla, extent, avance in mapa_hsp_progresivo(lat, lon, radio_mapa):
+            barra.progress(avance)
+            # Redibujar cuesta más que calcular: a lo sumo un cuadro cada 0.5 s, más el final
+            if escala is not None and avance < 1.0 and time.monotonic() - ultimo_dibujo < 0.5:
+                continue
+
+            valores = dimensionar_mapa(hsp_grilla, consumo, panel_w) if metrica == "Paneles Necesarios" else hsp_grilla
+            if escala is None:
+                finitos = valores[np.isfinite(valores)]
+                escala = (finitos.min(), finitos.max()) if finitos.size else (None, None)
+
+            fig_mapa, ax_mapa = plt.subplots(figsize=(8, 6))
+            img = ax_mapa.imshow(valores, extent=extent, origin='upper', cmap=cmap, aspect='auto',
+                                 vmin=escala[0], vmax=escala[1])
+            ax_mapa.plot(lon, lat, marker='*', color='cyan', markersize=14, label='Sitio')
+            ax_mapa.set_xlim(lon - radio_mapa, lon + radio_mapa)
+            ax_mapa.set_ylim(lat - radio_mapa, lat + radio_mapa)
+            ax_mapa.set_xlabel("Longitud")
+            ax_mapa.set_ylabel("Latitud")
+            ax_mapa.set_title(f"{metrica} - {consumo} kWh/día, Día Claro")
+            ax_mapa.legend(loc='upper right')
+            fig_mapa.colorbar(img, ax=ax_mapa, label=etiqueta, extend='both')
+            grafica_mapa.pyplot(fig_mapa)
+            plt.close(fig_mapa)
+            ultimo_dibujo = time.monotonic()
+        barra.empty()
 
 with tab3:
     st.header("🧮 Fórmulas Utilizadas")
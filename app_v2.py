@@ -3,6 +3,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import pvlib
 from pvlib.location import Location
+from turbidez_linke import obtener_turbidez_linke
 import math
 
 # --- CONFIGURACIÓN DE LA PÁGINA ---
@@ -20,7 +21,7 @@ def simular_curva_solar(lat, lon, potencia_pico_kw):
     tz = 'America/Caracas'
     site = Location(lat, lon, tz=tz)
     times = pd.date_range(start='2024-06-21 00:00', end='2024-06-21 23:59', freq='1h', tz=tz)
-    clearsky = site.get_clearsky(times)
+    clearsky = site.get_clearsky(times, linke_turbidity=obtener_turbidez_linke(times, lat, lon))
     # Eficiencia sistema 0.85
     generacion = (clearsky['ghi'] / 1000) * potencia_pico_kw * 0.85 
     generacion[generacion < 0] = 0
@@ -0,0 +1,206 @@
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# DEGRADACIÓN Y VIDA ÚTIL DEL BANCO DE BATERÍAS
+# ==========================================
+# Modelo: pérdida de capacidad = envejecimiento calendario + envejecimiento por ciclos.
+# - Ciclos: conteo rainflow sobre la serie de SOC, castigo por profundidad de descarga (Wöhler).
+# - Temperatura: Arrhenius simplificado, la degradación se duplica cada 10°C sobre 25°C.
+
+FIN_DE_VIDA = 0.80  # El banco se reemplaza al llegar al 80% de su capacidad nominal
+
+PARAMETROS_QUIMICA = {
+    "Litio": {
+        "ciclos_ref": 6000,       # Ciclos hasta fin de vida @ 80% DoD (LiFePO4)
+        "dod_ref": 0.80,
+        "exponente_dod": 1.1,     # ~10000 ciclos @ 50% DoD
+        "calendario_anual": 0.015,  # 1.5% de capacidad por año @ 25°C
+    },
+    "Plomo-Ácido": {
+        "ciclos_ref": 500,        # Ciclos hasta fin de vida @ 80% DoD (GEL/AGM)
+        "dod_ref": 0.80,
+        "exponente_dod": 1.8,     # ~1200 ciclos @ 50% DoD
+        "calendario_anual": 0.025,  # 2.5% por año @ 25°C (vida en flotación ~8 años)
+    },
+}
+
+
+def parametros_quimica(tipo_bat):
+    """Acepta los nombres de la interfaz ("Litio (LiFePO4)", "Plomo-Ácido (GEL)", ...)."""
+    return PARAMETROS_QUIMICA["Litio" if "Litio" in tipo_bat else "Plomo-Ácido"]
+
+
+def factor_arrhenius(temp_c):
+    """Aceleración de la degradación respecto a 25°C: x2 por cada 10°C (vectorizado)."""
+    return np.exp2((np.asarray(temp_c, dtype=np.float32) - 25) / 10)
+
+
+def _puntos_de_giro(soc):
+    """
+    Reduce una matriz [n_sitios, n_horas] a sus puntos de giro (picos y valles).
+    Devuelve arreglos planos (valor, índice plano original, id de sitio).
+    """
+    n_sitios, n_horas = soc.shape
+    pendiente = np.diff(soc, axis=1)
+    signo = (pendiente > 0).view(np.int8) - (pendiente < 0).view(np.int8)
+
+    # Mesetas: cada punto hereda la última pendiente no nula anterior
+    signo_previo = signo
+    if not signo.all():
+        col = np.arange(n_horas - 1, dtype=np.int32)
+        ultimo = np.maximum.accumulate(np.where(signo != 0, col, 0), axis=1)
+        signo_previo = np.take_along_axis(signo, ultimo, axis=1)
+
+    # Giro en la hora k si la pendiente previa y la siguiente tienen signo opuesto
+    giro = np.zeros((n_sitios, n_horas), dtype=bool)
+    giro[:, 1:-1] = signo_previo[:, :-1] * signo[:, 1:] < 0
+    giro[:, 0] = True
+    giro[:, -1] = True
+
+    sitio, hora = np.nonzero(giro)
+    return soc[sitio, hora], sitio * n_horas + hora, sitio
+
+
+def conteo_rainflow(valores, indices, sitio):
+    """
+    Conteo rainflow (método de 4 puntos) vectorizado sobre muchos sitios a la vez.
+
+    En cada pasada se extraen en bloque todos los ciclos internos B-C que cumplen
+    |B-C| <= |A-B| y |B-C| <= |C-D|, sin solaparse. Lo que queda al final es el
+    residuo, que se cuenta como medios ciclos.
+
+    Devuelve (rango, índice plano original, id de sitio, cuenta) por cada ciclo.
+    """
+    rangos, origen, sitios, cuentas = [], [], [], []
+
+    while valores.size >= 4:
+        r = np.abs(np.diff(valores))
+        mismo = sitio[:-1] == sitio[1:]
+        candidato = np.zeros(valores.size, dtype=bool)
+        candidato[1:-2] = (r[:-2] >= r[1:-1]) & (r[2:] >= r[1:-1]) & mismo[:-2] & mismo[1:-1] & mismo[2:]
+
+        # En rachas de candidatos seguidos (rangos iguales) se toma uno sí y uno no
+        pos = np.arange(valores.size)
+        arranque = candidato.copy()
+        arranque[1:] &= ~candidato[:-1]
+        inicio_racha = np.maximum.accumulate(np.where(arranque, pos, 0))
+        elegido = candidato & ((pos - inicio_racha) % 2 == 0)
+        if not elegido.any():
+            break
+
+        b = np.flatnonzero(elegido)
+        rangos.append(r[b])
+        origen.append(indices[b])
+        sitios.append(sitio[b])
+        cuentas.append(np.ones(b.size))
+
+        conservar = np.ones(valores.size, dtype=bool)
+        conservar[b] = False
+        conservar[b + 1] = False
+        valores, indices, sitio = valores[conservar], indices[conservar], sitio[conservar]
+
+    # Residuo: cada tramo entre puntos consecutivos del mismo sitio es medio ciclo
+    mismo = sitio[:-1] == sitio[1:]
+    rangos.append(np.abs(np.diff(valores))[mismo])
+    origen.append(indices[:-1][mismo])
+    sitios.append(sitio[:-1][mismo])
+    cuentas.append(np.full(mismo.sum(), 0.5))
+
+    return (np.concatenate(rangos), np.concatenate(origen),
+            np.concatenate(sitios), np.concatenate(cuentas))
+
+
+def proyectar_degradacion(times, soc, temp_c, tipo_bat="Litio (LiFePO4)", sitios_por_bloque=100):
+    """
+    Proyecta la pérdida de capacidad año a año a partir de series simuladas.
+
+    Parámetros:
+        times (DatetimeIndex): Marcas de tiempo equiespaciadas (ej. horarias, 20 años).
+        soc (array): Estado de carga 0-1, forma [n_horas] o [n_sitios, n_horas].
+        temp_c (array): Temperatura de la batería (°C), [n_horas] común o [n_sitios, n_horas].
+        tipo_bat (str): "Litio (LiFePO4)" o "Plomo-Ácido".
+        sitios_por_bloque (int): Sitios procesados a la vez (acota la memoria).
+    """
+    p = parametros_quimica(tipo_bat)
+    soc = np.atleast_2d(np.asarray(soc, dtype=np.float32))
+    temp_c = np.asarray(temp_c, dtype=np.float32)
+    n_sitios, n_horas = soc.shape
+
+    # Años de servicio transcurridos desde el inicio (no años calendario): una serie
+    # que arranca a mitad de año no deja un primer "año" incompleto
+    año_idx = np.asarray((times - times[0]) / pd.Timedelta(days=365.25)).astype(int)
+    n_años = int(año_idx[-1]) + 1
+    horas_paso = (times[1] - times[0]) / pd.Timedelta(hours=1)
+
+    # --- A. Envejecimiento calendario (todas las horas, con estrés térmico) ---
+    # Suma por año de servicio del factor térmico: reduceat sobre los cortes (times ordenado)
+    cortes = np.flatnonzero(np.r_[True, np.diff(año_idx) != 0])
+    tasa_hora = p["calendario_anual"] * horas_paso / 8760
+    if temp_c.ndim == 1:
+        perdida_calendario = np.add.reduceat(factor_arrhenius(temp_c), cortes) * tasa_hora
+        perdida_calendario = np.tile(perdida_calendario, (n_sitios, 1))
+    else:
+        perdida_calendario = np.zeros((n_sitios, n_años))
+        for s0 in range(0, n_sitios, sitios_por_bloque):
+            bloque_factor = factor_arrhenius(temp_c[s0:s0 + sitios_por_bloque])
+            perdida_calendario[s0:s0 + sitios_por_bloque] = np.add.reduceat(bloque_factor, cortes, axis=1) * tasa_hora
+
+    # --- B. Envejecimiento por ciclos (rainflow + DoD + temperatura del ciclo) ---
+    perdida_ciclos = np.zeros(n_sitios * n_años)
+    ciclos_equivalentes = np.zeros(n_sitios * n_años)
+
+    for s0 in range(0, n_sitios, sitios_por_bloque):
+        rango, origen, sitio, cuenta = conteo_rainflow(*_puntos_de_giro(soc[s0:s0 + sitios_por_bloque]))
+        sitio += s0
+        hora = origen % n_horas
+        temp_ciclo = temp_c[hora] if temp_c.ndim == 1 else temp_c[sitio, hora]
+
+        # Fracción de vida consumida por ciclo: (DoD/DoD_ref)^k / N_ref (regla de Miner)
+        vida_consumida = cuenta * (rango / p["dod_ref"]) ** p["exponente_dod"] / p["ciclos_ref"]
+        vida_consumida *= factor_arrhenius(temp_ciclo)
+
+        celda = sitio * n_años + año_idx[hora]
+        perdida_ciclos += np.bincount(celda, weights=vida_consumida * (1 - FIN_DE_VIDA), minlength=n_sitios * n_años)
+        ciclos_equivalentes += np.bincount(celda, weights=cuenta * rango, minlength=n_sitios * n_años)
+
+    perdida_ciclos = perdida_ciclos.reshape(n_sitios, n_años)
+    ciclos_equivalentes = ciclos_equivalentes.reshape(n_sitios, n_años)
+
+    capacidad = np.clip(1 - np.cumsum(perdida_calendario + perdida_ciclos, axis=1), 0, 1)
+
+    # Primer año en que la capacidad cae bajo el fin de vida (NaN si no ocurre)
+    bajo_umbral = capacidad < FIN_DE_VIDA
+    año_reemplazo = np.where(bajo_umbral.any(axis=1), bajo_umbral.argmax(axis=1) + 1, np.nan)
+
+    return {
+        "años": np.arange(1, n_años + 1),  # Año de servicio (1 = primeros 365.25 días)
+        "capacidad_relativa": capacidad,
+        "perdida_calendario": perdida_calendario,
+        "perdida_ciclos": perdida_ciclos,
+        "ciclos_equivalentes": ciclos_equivalentes,  # Ciclos completos (100% DoD) equivalentes
+        "año_reemplazo": año_reemplazo,  # Años de servicio hasta el reemplazo
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    # --- SIMULACIÓN: 1000 sitios, 20 años horarios, ciclo diario con días nublados ---
+    times = pd.date_range("2025-01-01", periods=20 * 8760, freq="1h")
+    rng = np.random.default_rng(0)
+    n = 1000
+    n_dias = len(times) // 24
+    hora_dia = np.asarray(times.hour)
+    # Profundidad de descarga distinta cada día (más honda tras un día nublado)
+    profundidad = rng.uniform(0.2, 0.9, size=(n, n_dias)).astype(np.float32)
+    forma = (0.5 - 0.5 * np.cos(2 * np.pi * hora_dia[:24] / 24)).astype(np.float32)
+    soc = (1 - profundidad[:, :, None] * forma).reshape(n, -1)
+    temp = (28 + 5 * np.sin(2 * np.pi * np.asarray(times.dayofyear) / 365)).astype(np.float32)
+
+    for tipo in ("Litio (LiFePO4)", "Plomo-Ácido"):
+        t0 = time.time()
+        res = proyectar_degradacion(times, soc, temp, tipo)
+        print(f"🔋 {tipo}: {time.time() - t0:.1f} s para {n} sitios x 20 años")
+        print(f"   Reemplazo (mediana): año {np.nanmedian(res['año_reemplazo']):.0f}")
+        print(f"   Capacidad al año 10 (sitio 0): {res['capacidad_relativa'][0, 9] * 100:.1f}%")
@@ -0,0 +1,111 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+import h5py
+import pvlib
+
+# ==========================================
+# GRILLAS GLOBALES DE PVLIB (HDF5) PRECARGADAS
+# ==========================================
+# LinkeTurbidities.h5 y Altitude.h5 comparten la misma grilla global de 5' (1/12°):
+# filas de 90°N a 90°S, columnas de 180°W a 180°E. Están comprimidas (gzip), así que
+# no se pueden mapear en memoria: la región de trabajo se lee UNA vez y queda en RAM;
+# fuera de ella se leen bloques del tamaño del chunk HDF5, también cacheados.
+
+CELDAS_POR_GRADO = 12
+FILAS_GLOBAL = 2160
+COLUMNAS_GLOBAL = 4320
+
+# Región precargada (Latinoamérica y Caribe): lat_max, lat_min, lon_min, lon_max
+REGION_LATAM = (33.0, -56.0, -118.0, -34.0)
+
+
+def ruta_dato_pvlib(nombre):
+    return os.path.join(os.path.dirname(pvlib.__file__), 'data', nombre)
+
+
+def indice_latitud(lat):
+    """Convierte latitudes (escalar o arreglo) a fila de la grilla global."""
+    fila = np.around((90.0 - np.asarray(lat, dtype=float)) * CELDAS_POR_GRADO - 0.5)
+    return np.clip(fila, 0, FILAS_GLOBAL - 1).astype(int)
+
+
+def indice_longitud(lon):
+    """Convierte longitudes (escalar o arreglo) a columna de la grilla global."""
+    columna = np.around((np.asarray(lon, dtype=float) + 180.0) * CELDAS_POR_GRADO - 0.5)
+    return np.clip(columna, 0, COLUMNAS_GLOBAL - 1).astype(int)
+
+
+@lru_cache(maxsize=8)
+def _recorte_h5(ruta, dataset, region=REGION_LATAM):
+    """
+    Lee una sola vez por proceso el recorte de la región de un dataset.
+    Devuelve (grilla [filas, columnas, ...], fila_0, columna_0).
+    """
+    lat_max, lat_min, lon_min, lon_max = region
+    fila_0, fila_1 = indice_latitud(lat_max), indice_latitud(lat_min) + 1
+    col_0, col_1 = indice_longitud(lon_min), indice_longitud(lon_max) + 1
+
+    with h5py.File(ruta, 'r') as archivo:
+        grilla = archivo[dataset][fila_0:fila_1, col_0:col_1]
+
+    return grilla, int(fila_0), int(col_0)
+
+
+@lru_cache(maxsize=8)
+def _forma_bloque(ruta, dataset):
+    """Filas y columnas del chunk HDF5 (leer un chunk entero cuesta lo mismo que una celda)."""
+    with h5py.File(ruta, 'r') as archivo:
+        chunks = archivo[dataset].chunks
+    return chunks[:2] if chunks else (216, 432)
+
+
+@lru_cache(maxsize=256)
+def _bloque_h5(ruta, dataset, bloque_fila, bloque_col):
+    """Un bloque (chunk) de la grilla fuera de la región precargada, cacheado."""
+    alto, ancho = _forma_bloque(ruta, dataset)
+    with h5py.File(ruta, 'r') as archivo:
+        return archivo[dataset][bloque_fila * alto:(bloque_fila + 1) * alto,
+                                bloque_col * ancho:(bloque_col + 1) * ancho]
+
+
+def buscar_en_grilla(ruta, dataset, lats, lons, region=REGION_LATAM):
+    """
+    Valores crudos de la grilla para muchos sitios a la vez (un índice vectorizado).
+    Los sitios fuera de la región se agrupan por bloque: una lectura por bloque, no por punto.
+    """
+    filas = indice_latitud(np.atleast_1d(lats))
+    columnas = indice_longitud(np.atleast_1d(lons))
+    grilla, fila_0, col_0 = _recorte_h5(ruta, dataset, region)
+
+    f, c = filas - fila_0, columnas - col_0
+    dentro = (f >= 0) & (f < grilla.shape[0]) & (c >= 0) & (c < grilla.shape[1])
+
+    valores = np.empty((len(filas),) + grilla.shape[2:], dtype=grilla.dtype)
+    valores[dentro] = grilla[f[dentro], c[dentro]]
+
+    if not dentro.all():
+        alto, ancho = _forma_bloque(ruta, dataset)
+        fuera = np.flatnonzero(~dentro)
+        bloque_f, bloque_c = filas[fuera] // alto, columnas[fuera] // ancho
+        for bf, bc in set(zip(bloque_f.tolist(), bloque_c.tolist())):
+            sel = (bloque_f == bf) & (bloque_c == bc)
+            bloque = _bloque_h5(ruta, dataset, bf, bc)
+            valores[fuera[sel]] = bloque[filas[fuera[sel]] - bf * alto, columnas[fuera[sel]] - bc * ancho]
+
+    return valores
+
+
+def altitud_lote(lats, lons, region=REGION_LATAM):
+    """
+    Altitud (m) para muchos sitios a la vez, igual que pvlib.location.lookup_altitude.
+    Sin Altitude.h5 (pvlib antiguo) devuelve 0, que es lo que usa Location en ese caso.
+    """
+    ruta = ruta_dato_pvlib('Altitude.h5')
+    if not os.path.exists(ruta):
+        return np.zeros(len(np.atleast_1d(lats)))
+
+    # uint8 en pasos de 28 m desde -450 m; 255 = sin dato
+    codigo = buscar_en_grilla(ruta, 'Altitude', lats, lons, region).astype(float)
+    return np.where(codigo == 255, 0.0, codigo * 28 - 450)
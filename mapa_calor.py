@@ -0,0 +1,203 @@
+import math
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from pvlib import solarposition, atmosphere, irradiance, clearsky
+
+from turbidez_linke import turbidez_linke_lote
+from grillas_pvlib import altitud_lote
+
+# ==========================================
+# MAPA DE CALOR REGIONAL (HSP / PANELES)
+# ==========================================
+# La región se parte en tiles alineados a una grilla global fija de TAMANO_TILE grados,
+# así al mover el centro del mapa se reutilizan los tiles ya calculados.
+# Solo la HSP depende de la ubicación (y es lo costoso): los tiles guardan HSP y el
+# dimensionamiento se aplica encima, así cambiar consumo o panel no recalcula nada.
+
+TAMANO_TILE = 1.0      # Grados por lado de cada tile
+PUNTOS_GRUESO = 4      # Puntos por lado en la pasada rápida (0.25°)
+PUNTOS_FINO = 20       # Puntos por lado en la pasada fina (0.05°)
+MAX_TILES_CACHE = 1024
+
+FECHA_DISEÑO = '2024-06-21'
+ZONA_HORARIA = 'America/Caracas'
+
+# Compartido por todas las sesiones de Streamlit (cada una en su hilo): usar con el candado
+_cache_tiles = OrderedDict()
+_candado_cache = threading.Lock()
+
+
+def clave_tile(**parametros):
+    """Hash estable de los parámetros que definen un tile."""
+    texto = json.dumps(parametros, sort_keys=True)
+    return hashlib.sha1(texto.encode()).hexdigest()
+
+
+def calcular_hsp_lote(lats, lons, fecha=FECHA_DISEÑO, tz=ZONA_HORARIA):
+    """
+    HSP de día claro (Ineichen) para muchos puntos a la vez, con las mismas entradas
+    que Location(lat, lon).get_clearsky(): altitud del terreno, presión por altitud
+    y cenit aparente (con refracción). La posición solar es la analítica de Spencer
+    en vez del SPA, para poder vectorizarla.
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    times = pd.date_range(start=f'{fecha} 00:00', end=f'{fecha} 23:59', freq='1h', tz=tz)
+    utc = times.tz_convert('UTC')
+
+    dia_año = np.asarray(utc.dayofyear)
+    declinacion = solarposition.declination_spencer71(dia_año)
+    ecuacion_tiempo = solarposition.equation_of_time_spencer71(dia_año)  # minutos
+    horas_utc = np.asarray(utc.hour + utc.minute / 60)
+
+    angulo_horario = np.radians(15 * (horas_utc - 12) + lons[:, None] + ecuacion_tiempo / 4)
+    zenit = np.degrees(solarposition.solar_zenith_analytical(np.radians(lats)[:, None], angulo_horario, declinacion))
+
+    altitud = altitud_lote(lats, lons)[:, None]
+    presion = atmosphere.alt2pres(altitud)
+    zenit_aparente = zenit - _refraccion(90 - zenit, presion)
+
+    airmass = atmosphere.get_absolute_airmass(atmosphere.get_relative_airmass(zenit_aparente), presion)
+    dni_extra = np.asarray(irradiance.get_extra_radiation(times))
+    turbidez = turbidez_linke_lote(times, lats, lons)
+
+    # De noche el airmass es NaN: pvlib avisa la división, el GHI queda en 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cs = clearsky.ineichen(zenit_aparente, airmass, turbidez, altitude=altitud, dni_extra=dni_extra)
+    ghi = np.nan_to_num(cs['ghi'])
+    return ghi.sum(axis=1) / 1000
+
+
+def _refraccion(elevacion, presion_pa, temp_c=12, refraccion_horizonte=0.5667):
+    """Corrección por refracción (grados), misma fórmula y valores por defecto que el SPA de pvlib."""
+    sol_visible = elevacion >= -(0.26667 + refraccion_horizonte)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        delta = ((presion_pa / 100 / 1010.0) * (283.0 / (273 + temp_c)) * 1.02
+                 / (60 * np.tan(np.radians(elevacion + 10.3 / (elevacion + 5.11)))))
+    return np.where(sol_visible, delta, 0.0)
+
+
+def calcular_tile(lat0, lon0, puntos):
+    """
+    HSP en una grilla de puntos x puntos dentro del tile con esquina SO (lat0, lon0).
+    Fila 0 = norte, para dibujar directo con imshow.
+    """
+    paso = TAMANO_TILE / puntos
+    lats = lat0 + TAMANO_TILE - paso * (np.arange(puntos) + 0.5)
+    lons = lon0 + paso * (np.arange(puntos) + 0.5)
+    malla_lat, malla_lon = np.meshgrid(lats, lons, indexing='ij')
+    return calcular_hsp_lote(malla_lat.ravel(), malla_lon.ravel()).reshape(puntos, puntos)
+
+
+def _clave(lat0, lon0, puntos):
+    return clave_tile(lat0=lat0, lon0=lon0, puntos=puntos, tamano=TAMANO_TILE,
+                      fecha=FECHA_DISEÑO, tz=ZONA_HORARIA)
+
+
+def _leer_cache(clave):
+    with _candado_cache:
+        tile = _cache_tiles.get(clave)
+        if tile is not None:
+            _cache_tiles.move_to_end(clave)
+        return tile
+
+
+def _guardar_cache(clave, tile):
+    with _candado_cache:
+        _cache_tiles[clave] = tile
+        _cache_tiles.move_to_end(clave)
+        while len(_cache_tiles) > MAX_TILES_CACHE:
+            _cache_tiles.popitem(last=False)
+
+
+def _calcular_y_guardar(lat0, lon0, puntos):
+    """Calcula un tile y lo guarda en caché desde el mismo hilo de trabajo."""
+    tile = calcular_tile(lat0, lon0, puntos)
+    _guardar_cache(_clave(lat0, lon0, puntos), tile)
+    return tile
+
+
+def tiles_region(lat_centro, lon_centro, radio_grados):
+    """Esquinas SO de los tiles (alineados a la grilla global) que cubren la región."""
+    lat_min = math.floor((lat_centro - radio_grados) / TAMANO_TILE) * TAMANO_TILE
+    lat_max = math.ceil((lat_centro + radio_grados) / TAMANO_TILE) * TAMANO_TILE
+    lon_min = math.floor((lon_centro - radio_grados) / TAMANO_TILE) * TAMANO_TILE
+    lon_max = math.ceil((lon_centro + radio_grados) / TAMANO_TILE) * TAMANO_TILE
+
+    lats = np.arange(lat_min, lat_max, TAMANO_TILE)
+    lons = np.arange(lon_min, lon_max, TAMANO_TILE)
+    return [(round(float(la), 6), round(float(lo), 6)) for la in lats for lo in lons], \
+        (lon_min, lon_max, lat_min, lat_max)
+
+
+def mapa_hsp_progresivo(lat_centro, lon_centro, radio_grados, trabajadores=4):
+    """
+    Generador: entrega (grilla_hsp, extent, fraccion_lista) a medida que se refina.
+    1) Pasada gruesa de toda la región (rápida), 2) tiles finos desde el pool de hilos.
+    Los tiles que ya están en caché no se recalculan.
+    """
+    tiles, extent = tiles_region(lat_centro, lon_centro, radio_grados)
+    lon_min, lon_max, lat_min, lat_max = extent
+    filas = int(round((lat_max - lat_min) / TAMANO_TILE))
+    columnas = int(round((lon_max - lon_min) / TAMANO_TILE))
+    lienzo = np.full((filas * PUNTOS_FINO, columnas * PUNTOS_FINO), np.nan)
+
+    def pegar(lat0, lon0, tile):
+        f = int(round((lat_max - lat0) / TAMANO_TILE)) - 1
+        c = int(round((lon0 - lon_min) / TAMANO_TILE))
+        escala = PUNTOS_FINO // tile.shape[0]
+        lienzo[f * PUNTOS_FINO:(f + 1) * PUNTOS_FINO,
+               c * PUNTOS_FINO:(c + 1) * PUNTOS_FINO] = np.kron(tile, np.ones((escala, escala)))
+
+    # Tiles finos ya calculados antes: se pegan directo
+    pendientes = []
+    for lat0, lon0 in tiles:
+        tile = _leer_cache(_clave(lat0, lon0, PUNTOS_FINO))
+        if tile is not None:
+            pegar(lat0, lon0, tile)
+        else:
+            pendientes.append((lat0, lon0))
+
+    if not pendientes:
+        yield lienzo, extent, 1.0
+        return
+
+    # 1) Pasada gruesa para los tiles que faltan
+    for lat0, lon0 in pendientes:
+        clave = _clave(lat0, lon0, PUNTOS_GRUESO)
+        tile = _leer_cache(clave)
+        if tile is None:
+            tile = calcular_tile(lat0, lon0, PUNTOS_GRUESO)
+            _guardar_cache(clave, tile)
+        pegar(lat0, lon0, tile)
+    listos = len(tiles) - len(pendientes)
+    yield lienzo, extent, listos / len(tiles)
+
+    # 2) Refinamiento: tiles finos en paralelo, se entregan apenas terminan.
+    # Si Streamlit corta el generador (rerun), lo ya calculado queda en caché y lo
+    # pendiente se cancela.
+    pool = ThreadPoolExecutor(max_workers=trabajadores)
+    try:
+        futuros = {pool.submit(_calcular_y_guardar, lat0, lon0, PUNTOS_FINO): (lat0, lon0)
+                   for lat0, lon0 in pendientes}
+        for futuro in as_completed(futuros):
+            lat0, lon0 = futuros[futuro]
+            pegar(lat0, lon0, futuro.result())
+            listos += 1
+            yield lienzo, extent, listos / len(tiles)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def dimensionar_mapa(hsp, consumo_diario_kwh, potencia_panel_w, eficiencia_sistema=0.85):
+    """Paneles necesarios en cada punto (mismas reglas que dimensionar_sistema_completo)."""
+    energia_generacion_objetivo = consumo_diario_kwh * 1000 * 1.3
+    gen_un_panel = potencia_panel_w * hsp * eficiencia_sistema
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.ceil(energia_generacion_objetivo / gen_un_panel)
@@ -0,0 +1,215 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# INGESTA DE DATOS DE MEDIDOR (CSV / Parquet)
+# ==========================================
+# El archivo se lee por bloques: cada bloque se agrega a intervalos regulares
+# (ej. 1h) y se descarta. La memoria depende del número de intervalos del
+# período medido, no del número de filas del archivo.
+
+
+def _leer_bloques(ruta, col_tiempo, col_valor, tamano_bloque):
+    """Itera el archivo en DataFrames de a lo sumo `tamano_bloque` filas."""
+    extension = os.path.splitext(ruta)[1].lower()
+
+    if extension in (".parquet", ".pq"):
+        import pyarrow.parquet as pq  # Solo hace falta para Parquet
+
+        archivo = pq.ParquetFile(ruta)
+        for lote in archivo.iter_batches(batch_size=tamano_bloque, columns=[col_tiempo, col_valor]):
+            yield lote.to_pandas()
+    else:
+        yield from pd.read_csv(ruta, usecols=[col_tiempo, col_valor], chunksize=tamano_bloque)
+
+
+ZONA_MIXTA = "mixta"  # Offsets distintos en el mismo archivo (ej. cambio de hora en CSV)
+TIPOS_VALOR = ("energia_kwh", "potencia_kw")
+
+
+def _a_utc(columna, tz):
+    """
+    Convierte la columna de tiempo a UTC. Soporta offsets mixtos (cambios de horario).
+    Devuelve (tiempos UTC, zona de origen): None si el archivo no traía zona, la zona u
+    offset si es una sola, o ZONA_MIXTA.
+    """
+    if pd.api.types.is_datetime64_any_dtype(columna):
+        tiempos = columna
+    else:
+        try:
+            tiempos = pd.to_datetime(columna, errors="coerce")
+        except ValueError:
+            # Offsets mixtos: solo se pueden unificar pasando por UTC
+            return pd.to_datetime(columna, utc=True, errors="coerce"), ZONA_MIXTA
+
+    zona = tiempos.dt.tz
+    if zona is not None:
+        return tiempos.dt.tz_convert("UTC"), zona
+    if tz is None:
+        return tiempos.dt.tz_localize("UTC"), None
+    # Hora local sin offset: las horas ambiguas/inexistentes del cambio de hora se descartan
+    return tiempos.dt.tz_localize(tz, ambiguous="NaT", nonexistent="NaT").dt.tz_convert("UTC"), None
+
+
+def _rellenar_huecos(serie_kw, max_hueco_h):
+    """
+    Huecos de hasta max_hueco_h se interpolan completos; los más largos se rellenan
+    enteros con el promedio del mismo mes y hora (nunca una mezcla de ambos).
+    """
+    faltante = serie_kw.isna()
+    racha = (faltante != faltante.shift()).cumsum()
+    largo_racha = faltante.groupby(racha).transform("sum")
+
+    pasos_por_hora = pd.Timedelta(hours=1) / pd.Timedelta(serie_kw.index.freq)
+    corto = faltante & (largo_racha <= max_hueco_h * pasos_por_hora)
+    interpolada = serie_kw.interpolate(limit_area="inside")
+    serie_kw = serie_kw.mask(corto, interpolada)
+
+    if serie_kw.isna().any():
+        tramo = serie_kw.index.hour * 60 + serie_kw.index.minute
+        por_mes_y_hora = serie_kw.groupby([serie_kw.index.month, tramo]).transform("mean")
+        por_hora = serie_kw.groupby(tramo).transform("mean")
+        serie_kw = serie_kw.fillna(por_mes_y_hora).fillna(por_hora)
+    return serie_kw
+
+
+def leer_medidor(ruta, col_tiempo="timestamp", col_valor="kwh", tipo_valor="energia_kwh",
+                 frecuencia="1h", intervalo_medidor_min=None, max_hueco_h=3, tz=None,
+                 tamano_bloque=500_000):
+    """
+    Lee una exportación de medidor inteligente y la convierte en un perfil de carga.
+
+    Parámetros:
+        ruta (str): Archivo .csv o .parquet.
+        col_tiempo (str): Columna con la fecha/hora de cada lectura.
+        col_valor (str): Columna con la lectura.
+        tipo_valor (str): "energia_kwh" (kWh por intervalo) o "potencia_kw" (demanda media en kW).
+        frecuencia (str): Resolución del perfil ("1h", "15min", ...).
+        intervalo_medidor_min (float): Minutos entre lecturas. Si es None se infiere de las
+            primeras lecturas válidas del archivo.
+        max_hueco_h (float): Huecos hasta esta duración se interpolan; los mayores se rellenan
+            con el promedio del mismo mes y hora.
+        tz (str): Zona horaria local del perfil (ej. "America/Caracas"). Las lecturas con offset
+            se convierten a ella; las que no traen zona se toman como hora local de tz.
+            Si es None el perfil queda en la zona del archivo (o sin zona, si no la traía);
+            si el archivo trae varios offsets (ej. un CSV que cruza un cambio de hora) hay
+            que indicarla.
+        tamano_bloque (int): Filas leídas por bloque (acota la memoria).
+    """
+    if tipo_valor not in TIPOS_VALOR:
+        raise ValueError(f"tipo_valor debe ser uno de {TIPOS_VALOR}, no {tipo_valor!r}")
+
+    agregados = []
+    pico, hora_pico = -np.inf, None
+    filas = 0
+    zonas = {}  # Zonas de origen vistas en el archivo
+    tiempo_previo = None  # Última lectura del bloque anterior, para inferir el intervalo
+
+    for bloque in _leer_bloques(ruta, col_tiempo, col_valor, tamano_bloque):
+        tiempo, zona = _a_utc(bloque[col_tiempo], tz)
+        valor = pd.to_numeric(bloque[col_valor], errors="coerce")
+        validos = valor.notna() & tiempo.notna()
+        tiempo, valor = tiempo[validos], valor[validos]
+        if valor.empty:
+            continue
+        zonas[str(zona)] = zona
+
+        if intervalo_medidor_min is None:
+            # Se busca entre bloques: un bloque de una sola fila no alcanza para inferirlo
+            pasos = pd.concat([pd.Series([tiempo_previo]).dropna(), tiempo]).diff()
+            pasos = pasos[pasos > pd.Timedelta(0)]
+            if not pasos.empty:
+                intervalo_medidor_min = pasos.median() / pd.Timedelta(minutes=1)
+            tiempo_previo = tiempo.iloc[-1]
+
+        # El pico y la suma se guardan en la unidad original; se pasan a kW al final
+        i_max = valor.values.argmax()
+        if valor.values[i_max] > pico:
+            pico, hora_pico = float(valor.values[i_max]), tiempo.iloc[i_max]
+
+        grupos = valor.groupby(tiempo.dt.floor(frecuencia))
+        agregados.append(pd.DataFrame({"suma": grupos.sum(), "n": grupos.count()}))
+        filas += len(valor)
+
+    if not agregados:
+        raise ValueError(f"No se encontraron lecturas válidas en {ruta}")
+    if tz is None and (len(zonas) > 1 or ZONA_MIXTA in zonas):
+        raise ValueError(f"{ruta} trae lecturas en varias zonas u offsets horarios; indique tz")
+
+    if tipo_valor == "energia_kwh":
+        # kWh por intervalo -> potencia media (kW) del intervalo
+        if intervalo_medidor_min is None:
+            raise ValueError(f"No se pudo inferir el intervalo del medidor en {ruta}; "
+                             "indique intervalo_medidor_min")
+        a_kw = 60 / intervalo_medidor_min
+    else:
+        a_kw = 1.0
+
+    # Intervalos partidos entre dos bloques se juntan aquí
+    total = pd.concat(agregados).groupby(level=0).sum()
+    indice = pd.date_range(total.index.min(), total.index.max(), freq=frecuencia)
+    serie_kw = (total["suma"] / total["n"] * a_kw).reindex(indice)
+    if serie_kw.isna().all():
+        raise ValueError(f"No quedaron lecturas utilizables en {ruta}")
+
+    # Del reloj UTC a la hora local: tz, o la zona del archivo (sin zona si no la traía)
+    zona_salida = tz if tz is not None else next(iter(zonas.values()))
+    if zona_salida is not None:
+        serie_kw.index, hora_pico = serie_kw.index.tz_convert(zona_salida), hora_pico.tz_convert(zona_salida)
+    else:
+        serie_kw.index, hora_pico = serie_kw.index.tz_localize(None), hora_pico.tz_localize(None)
+    serie_kw.index = pd.DatetimeIndex(serie_kw.index, freq=frecuencia)  # tz_localize pierde la frecuencia
+
+    faltantes = serie_kw.isna()
+    serie_kw = _rellenar_huecos(serie_kw, max_hueco_h)
+
+    return construir_perfil(serie_kw, pico * a_kw, hora_pico, filas, faltantes.mean())
+
+
+def construir_perfil(serie_kw, pico_kw=None, hora_pico=None, filas=None, fraccion_rellena=0.0):
+    """
+    Día típico, año típico y estadísticas de dimensionamiento a partir de una
+    serie regular de potencia (kW).
+    """
+    horas_paso = pd.Timedelta(serie_kw.index.freq) / pd.Timedelta(hours=1)
+    tramo = serie_kw.index.hour * 60 + serie_kw.index.minute
+
+    # Día típico: potencia media por hora del día. Año típico: por mes y hora.
+    dia_tipico = serie_kw.groupby(tramo).mean()
+    año_tipico = serie_kw.groupby([serie_kw.index.month, tramo]).mean().unstack()
+    dia_tipico.index.name = año_tipico.columns.name = "minuto_del_dia"
+    año_tipico.index.name = "mes"
+
+    # Solo días completos cuentan para la distribución de energía diaria. La serie es
+    # regular, así que solo el primer y el último día pueden estar cortados (contar
+    # pasos por día no sirve: con cambio de hora hay días de 23 y 25 horas).
+    energia_diaria = serie_kw.groupby(serie_kw.index.date).sum() * horas_paso
+    paso = pd.Timedelta(serie_kw.index.freq)
+    if serie_kw.index[0] != serie_kw.index[0].normalize():
+        energia_diaria = energia_diaria.iloc[1:]
+    if (serie_kw.index[-1] + paso).time() != pd.Timestamp(0).time():
+        energia_diaria = energia_diaria.iloc[:-1]
+    if energia_diaria.empty:
+        raise ValueError("Las lecturas no cubren ningún día completo; hace falta al menos uno")
+
+    i_pico = serie_kw.values.argmax()
+    if pico_kw is None:
+        pico_kw, hora_pico = serie_kw.values[i_pico], serie_kw.index[i_pico]
+
+    return {
+        "serie_kw": serie_kw,
+        "dia_tipico_kw": dia_tipico,
+        "año_tipico_kw": año_tipico,
+        "energia_diaria_kwh": energia_diaria,
+        "energia_diaria_media_wh": round(energia_diaria.mean() * 1000, 1),
+        "energia_diaria_p90_wh": round(energia_diaria.quantile(0.9) * 1000, 1),
+        "energia_diaria_max_wh": round(energia_diaria.max() * 1000, 1),
+        "pico_coincidente_w": round(serie_kw.values[i_pico] * 1000, 1),  # A la resolución del perfil
+        "pico_medido_w": round(pico_kw * 1000, 1),  # Lectura individual más alta
+        "hora_pico": hora_pico,
+        "factor_carga": round(serie_kw.mean() / serie_kw.values[i_pico], 3),
+        "lecturas": filas,
+        "fraccion_rellena": round(float(fraccion_rellena), 4),
+    }
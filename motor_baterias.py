@@ -1,8 +1,10 @@
 import math
+from medidor_carga import leer_medidor
 
 class CargaCritica:
     def __init__(self):
         self.equipos = [] # Lista para guardar los electrodomésticos
+        self.perfil_medidor = None # Perfil medido (opcional, ver cargar_medidor)
 
     def agregar_equipo(self, nombre, potencia_watts, cantidad, horas_uso_diario):
         """
@@ -21,13 +23,30 @@ class CargaCritica:
         self.equipos.append(equipo)
         print(f"✅ Agregado: {cantidad}x {nombre} ({consumo_total_equipo} Wh/día)")
 
+    def cargar_medidor(self, ruta, **opciones):
+        """
+        Carga meses de datos de un medidor inteligente (CSV/Parquet) como perfil de carga.
+        Las opciones se pasan a leer_medidor (columnas, tipo de valor, frecuencia...).
+        """
+        self.perfil_medidor = leer_medidor(ruta, **opciones)
+        p = self.perfil_medidor
+        print(f"✅ Medidor: {p['lecturas']} lecturas, {len(p['energia_diaria_kwh'])} días "
+              f"({p['energia_diaria_media_wh']:.0f} Wh/día promedio)")
+        print(f"   Pico medido {p['pico_medido_w']:.0f} W (usado para el inversor), "
+              f"pico coincidente del perfil {p['pico_coincidente_w']:.0f} W")
+
     def obtener_consumo_total_diario(self):
         total_wh = sum(e['wh_dia'] for e in self.equipos)
+        if self.perfil_medidor is not None:
+            total_wh += self.perfil_medidor['energia_diaria_media_wh']
         return total_wh
 
     def obtener_potencia_pico(self):
         # Asumimos el peor caso: todo se prende a la vez (para el inversor más adelante)
         total_watts = sum(e['potencia_w'] * e['cantidad'] for e in self.equipos)
+        # Lo medido ya es coincidente: se suma la lectura más alta como una sola carga
+        if self.perfil_medidor is not None:
+            total_watts += self.perfil_medidor['pico_medido_w']
         return total_watts
 
 class BancoBaterias:
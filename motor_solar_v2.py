@@ -2,6 +2,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import pvlib
 from pvlib.location import Location
+from turbidez_linke import obtener_turbidez_linke
 import math
 
 # ==========================================
@@ -24,7 +25,8 @@ def simular_curva_solar(lat, lon, fecha, potencia_pico_kw, eficiencia=0.85):
     solpos = site.get_solarposition(times)
     
     # Modelo de Cielo Despejado (Ineichen) - Ideal para dimensionamiento base
-    clearsky = site.get_clearsky(times)
+    # Turbidez de Linke precargada (evita releer el HDF5 de pvlib en cada llamada)
+    clearsky = site.get_clearsky(times, linke_turbidity=obtener_turbidez_linke(times, lat, lon))
     
     # GHI = Global Horizontal Irradiance (Radiación total)
     # Estimación simple: Potencia = GHI * (Area/1000) * Eficiencia... 
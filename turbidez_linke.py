@@ -0,0 +1,70 @@
+import calendar
+
+import numpy as np
+import pandas as pd
+
+from grillas_pvlib import REGION_LATAM, ruta_dato_pvlib, buscar_en_grilla
+
+# ==========================================
+# TURBIDEZ DE LINKE PRECARGADA (Ineichen)
+# ==========================================
+# pvlib abre y lee LinkeTurbidities.h5 en cada llamada a get_clearsky().
+# La grilla (2160 x 4320 x 12, uint8, valores = 20 * TL) se precarga con grillas_pvlib.
+
+
+def _mitades_de_mes(año):
+    """Día del año a mitad de cada mes, con Dic anterior y Ene siguiente."""
+    dias_mes = np.array(calendar.mdays[1:], dtype=float)
+    dias_año = 365
+    if calendar.isleap(año):
+        dias_mes[1] += 1
+        dias_año = 366
+    return np.concatenate([
+        [-calendar.mdays[12] / 2.0],
+        np.cumsum(dias_mes) - dias_mes / 2.0,
+        [dias_año + calendar.mdays[1] / 2.0],
+    ])
+
+
+def turbidez_mensual_lote(lats, lons, region=REGION_LATAM):
+    """
+    Busca los 12 valores mensuales de turbidez para muchos sitios a la vez.
+    Devuelve un arreglo [n_sitios, 12] ya dividido entre 20.
+    """
+    ruta = ruta_dato_pvlib('LinkeTurbidities.h5')
+    return buscar_en_grilla(ruta, 'LinkeTurbidity', lats, lons, region) / 20.0
+
+
+def turbidez_linke_lote(times, lats, lons, region=REGION_LATAM):
+    """
+    Turbidez de Linke interpolada día a día (igual que pvlib) para muchos sitios.
+    Devuelve un arreglo [n_sitios, len(times)].
+    """
+    mensual = turbidez_mensual_lote(lats, lons, region)
+    # Agregamos Dic anterior y Ene siguiente para interpolar los extremos del año
+    mensual = np.concatenate([mensual[:, -1:], mensual, mensual[:, :1]], axis=1)
+
+    # Igual que pvlib: la interpolación usa el día del año en UTC
+    times_utc = times.tz_convert('UTC') if times.tz is not None else times
+    dia_año = np.asarray(times_utc.dayofyear, dtype=float)
+    bisiesto = np.asarray(times_utc.is_leap_year)
+
+    resultado = np.empty((mensual.shape[0], len(times)), dtype=float)
+    for es_bisiesto, año_ref in ((True, 2016), (False, 2015)):
+        cols = bisiesto == es_bisiesto
+        if not cols.any():
+            continue
+        mitades = _mitades_de_mes(año_ref)
+        # Interpolación lineal vectorizada sobre todos los sitios a la vez
+        pos = np.searchsorted(mitades, dia_año[cols], side='right') - 1
+        pos = np.clip(pos, 0, len(mitades) - 2)
+        peso = (dia_año[cols] - mitades[pos]) / (mitades[pos + 1] - mitades[pos])
+        resultado[:, cols] = mensual[:, pos] * (1 - peso) + mensual[:, pos + 1] * peso
+
+    return resultado
+
+
+def obtener_turbidez_linke(times, lat, lon):
+    """Turbidez de Linke para un sitio, como Serie lista para get_clearsky()."""
+    return pd.Series(turbidez_linke_lote(times, [lat], [lon])[0], index=times)
+